@@ -0,0 +1,235 @@
+# Copyright (c) Meta Platforms, Inc. and affiliates.
+# All rights reserved.
+#
+# This source code is licensed under the BSD-style license found in the
+# LICENSE file in the root directory of this source tree.
+
+# pyre-strict
+
+"""
+Builds the binary flatbuffer for a VkGraph in-process with `flatbuffers.Builder`,
+without going through JSON and `flatc`.
+
+The slot indices and union type ids used below follow the field declaration order in
+schema.fbs, and must be kept in sync with it.
+"""
+
+import struct
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Type, Union
+
+import flatbuffers
+
+from executorch.backends.vulkan.serialization.vulkan_graph_schema import (
+    Bool,
+    BoolList,
+    Double,
+    DoubleList,
+    GraphTypes,
+    Int,
+    IntList,
+    Null,
+    OperatorCall,
+    String,
+    ValueList,
+    VkBytes,
+    VkGraph,
+    VkMemoryLayout,
+    VkStorageType,
+    VkTensor,
+    VkValue,
+)
+
+FILE_IDENTIFIER: bytes = b"VK00"
+
+_UOFFSET_SIZE: int = 4
+
+# The elements of a vector of scalars, e.g. the items of an IntList.
+_Scalars = Sequence[Union[int, float, bool]]
+
+
+def _scalar_vector_creator(
+    fmt: str,
+) -> Callable[[flatbuffers.Builder, _Scalars], int]:
+    """
+    Returns a function that writes a vector of scalars, whose struct format character
+    is `fmt`, into the builder with a single `struct.pack_into` instead of prepending
+    the elements one at a time.
+    """
+    elem_size = struct.calcsize(f"<{fmt}")
+
+    def create(builder: flatbuffers.Builder, items: _Scalars) -> int:
+        num_elems = len(items)
+        # StartVector reserves (and aligns) the space for the elements, which are then
+        # written directly below the builder's head, as Builder.CreateNumpyVector does.
+        builder.StartVector(elem_size, num_elems, elem_size)
+        builder.head = builder.Head() - elem_size * num_elems
+        struct.pack_into(f"<{num_elems}{fmt}", builder.Bytes, builder.Head(), *items)
+        return builder.EndVector()
+
+    return create
+
+
+_create_uint32_vector = _scalar_vector_creator("I")
+_create_int32_vector = _scalar_vector_creator("i")
+_create_int64_vector = _scalar_vector_creator("q")
+_create_float64_vector = _scalar_vector_creator("d")
+_create_bool_vector = _scalar_vector_creator("?")
+
+
+def _create_offset_vector(builder: flatbuffers.Builder, offsets: List[int]) -> int:
+    builder.StartVector(_UOFFSET_SIZE, len(offsets), _UOFFSET_SIZE)
+    for offset in reversed(offsets):
+        builder.PrependUOffsetTRelative(offset)
+    return builder.EndVector()
+
+
+def _build_operator_call(builder: flatbuffers.Builder, op: OperatorCall) -> int:
+    name = builder.CreateString(op.name)
+    args = _create_int32_vector(builder, op.args)
+    builder.StartObject(3)
+    builder.PrependUint32Slot(0, op.node_id, 0)
+    builder.PrependUOffsetTRelativeSlot(1, name, 0)
+    builder.PrependUOffsetTRelativeSlot(2, args, 0)
+    return builder.EndObject()
+
+
+def _build_vk_tensor(builder: flatbuffers.Builder, tensor: VkTensor) -> int:
+    dims = _create_uint32_vector(builder, tensor.dims)
+    builder.StartObject(6)
+    builder.PrependInt8Slot(0, tensor.datatype, 0)
+    builder.PrependUOffsetTRelativeSlot(1, dims, 0)
+    builder.PrependInt32Slot(2, tensor.constant_id, 0)
+    builder.PrependInt32Slot(3, tensor.mem_obj_id, 0)
+    builder.PrependUint8Slot(4, tensor.storage_type, VkStorageType.DEFAULT_STORAGE)
+    builder.PrependUint8Slot(5, tensor.memory_layout, VkMemoryLayout.DEFAULT_LAYOUT)
+    return builder.EndObject()
+
+
+def _build_null(builder: flatbuffers.Builder, value: Null) -> int:
+    builder.StartObject(0)
+    return builder.EndObject()
+
+
+def _build_int(builder: flatbuffers.Builder, value: Int) -> int:
+    builder.StartObject(1)
+    builder.PrependInt64Slot(0, value.int_val, 0)
+    return builder.EndObject()
+
+
+def _build_double(builder: flatbuffers.Builder, value: Double) -> int:
+    builder.StartObject(1)
+    builder.PrependFloat64Slot(0, value.double_val, 0.0)
+    return builder.EndObject()
+
+
+def _build_bool(builder: flatbuffers.Builder, value: Bool) -> int:
+    builder.StartObject(1)
+    builder.PrependBoolSlot(0, value.bool_val, False)
+    return builder.EndObject()
+
+
+def _build_string(builder: flatbuffers.Builder, value: String) -> int:
+    string_val = builder.CreateString(value.string_val)
+    builder.StartObject(1)
+    builder.PrependUOffsetTRelativeSlot(0, string_val, 0)
+    return builder.EndObject()
+
+
+_ListTypes = Union[IntList, DoubleList, BoolList, ValueList]
+
+
+def _list_builder(
+    create_vector: Callable[[flatbuffers.Builder, _Scalars], int]
+) -> Callable[[flatbuffers.Builder, _ListTypes], int]:
+    def build(builder: flatbuffers.Builder, value: _ListTypes) -> int:
+        items = create_vector(builder, value.items)
+        builder.StartObject(1)
+        builder.PrependUOffsetTRelativeSlot(0, items, 0)
+        return builder.EndObject()
+
+    return build
+
+
+# Maps each member of the GraphTypes union to its union type id in schema.fbs (0 is
+# reserved for NONE) and to the function that builds its table.
+_GRAPH_TYPES: Dict[
+    Type[GraphTypes], Tuple[int, Callable[[flatbuffers.Builder, Any], int]]
+] = {
+    Null: (1, _build_null),
+    Int: (2, _build_int),
+    Double: (3, _build_double),
+    Bool: (4, _build_bool),
+    VkTensor: (5, _build_vk_tensor),
+    IntList: (6, _list_builder(_create_int64_vector)),
+    DoubleList: (7, _list_builder(_create_float64_vector)),
+    BoolList: (8, _list_builder(_create_bool_vector)),
+    ValueList: (9, _list_builder(_create_int32_vector)),
+    String: (10, _build_string),
+}
+
+
+def _build_vk_value(builder: flatbuffers.Builder, vk_value: VkValue) -> int:
+    value = vk_value.value
+    value_type, build_fn = _GRAPH_TYPES[type(value)]
+    value_offset = build_fn(builder, value)
+    builder.StartObject(2)
+    builder.PrependUint8Slot(0, value_type, 0)
+    builder.PrependUOffsetTRelativeSlot(1, value_offset, 0)
+    return builder.EndObject()
+
+
+def _build_vk_bytes(builder: flatbuffers.Builder, vk_bytes: VkBytes) -> int:
+    builder.StartObject(2)
+    builder.PrependUint64Slot(0, vk_bytes.offset, 0)
+    builder.PrependUint64Slot(1, vk_bytes.length, 0)
+    return builder.EndObject()
+
+
+def vk_graph_to_flatbuffer(vk_graph: VkGraph) -> bytes:
+    """
+    Serializes `vk_graph` into the binary flatbuffer format described by schema.fbs.
+    """
+    # Size the initial buffer from the graph so that the builder rarely has to grow
+    # (and copy) its internal buffer.
+    initial_size = max(1024, (len(vk_graph.chain) + len(vk_graph.values)) * 64)
+    builder = flatbuffers.Builder(initial_size)
+
+    # Child objects must be fully built before the table that references them is
+    # started, so build the graph bottom-up.
+    version = builder.CreateString(vk_graph.version)
+    chain = _create_offset_vector(
+        builder, [_build_operator_call(builder, op) for op in vk_graph.chain]
+    )
+    values = _create_offset_vector(
+        builder, [_build_vk_value(builder, value) for value in vk_graph.values]
+    )
+    input_ids = _create_uint32_vector(builder, vk_graph.input_ids)
+    output_ids = _create_uint32_vector(builder, vk_graph.output_ids)
+    constants = _create_offset_vector(
+        builder, [_build_vk_bytes(builder, b) for b in vk_graph.constants]
+    )
+    shaders = _create_offset_vector(
+        builder, [_build_vk_bytes(builder, b) for b in vk_graph.shaders]
+    )
+
+    builder.StartObject(9)
+    builder.PrependUOffsetTRelativeSlot(0, version, 0)
+    builder.PrependUOffsetTRelativeSlot(1, chain, 0)
+    builder.PrependUOffsetTRelativeSlot(2, values, 0)
+    builder.PrependUOffsetTRelativeSlot(3, input_ids, 0)
+    builder.PrependUOffsetTRelativeSlot(4, output_ids, 0)
+    builder.PrependUOffsetTRelativeSlot(5, constants, 0)
+    builder.PrependUOffsetTRelativeSlot(6, shaders, 0)
+    builder.PrependUint8Slot(
+        7, vk_graph.storage_type_override, VkStorageType.DEFAULT_STORAGE
+    )
+    builder.PrependUint8Slot(
+        8, vk_graph.memory_layout_override, VkMemoryLayout.DEFAULT_LAYOUT
+    )
+    graph = builder.EndObject()
+
+    builder.Finish(graph, file_identifier=FILE_IDENTIFIER)
+    # builder.Output() slices the builder's bytearray, which is a copy that bytes()
+    # would then copy again. Copy straight out of a view of the buffer instead.
+    return bytes(memoryview(builder.Bytes)[builder.Head() :])
@@ -5,44 +5,197 @@
 # LICENSE file in the root directory of this source tree.
 
 import ctypes
+import importlib.resources
 import json
+import math
 import os
+import struct
 import tempfile
 
 from dataclasses import dataclass
-from typing import ClassVar, List
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Type, Union
 
-import pkg_resources
 import torch
 
+from executorch.backends.vulkan.serialization.vulkan_graph_flatbuffer import (
+    vk_graph_to_flatbuffer,
+)
 from executorch.backends.vulkan.serialization.vulkan_graph_schema import (
+    Bool,
+    BoolList,
+    Double,
+    DoubleList,
+    GraphTypes,
+    Int,
+    IntList,
+    Null,
+    OperatorCall,
+    String,
+    ValueList,
     VkBytes,
     VkGraph,
+    VkTensor,
+    VkValue,
 )
-from executorch.exir._serialize._dataclass import _DataclassEncoder
 
 from executorch.exir._serialize._flatbuffer import _flatc_compile
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # The flatc bindings are not built in every environment (e.g. pip installs); when
+    # they are missing, fall back to running the flatc executable.
+    from executorch.exir._serialize import (  # @manual=//executorch/exir/_serialize:_bindings
+        _bindings,
+    )
+except ImportError:
+    _bindings = None
+
+# If this environment variable is set to true, serialize the VkGraph by converting it
+# to JSON and compiling it with flatc instead of building the flatbuffer in-process.
+_USE_FLATC_ENV: str = "ET_VULKAN_SERIALIZE_WITH_FLATC"
+
+# The schema is invariant, so load it once rather than on every serialization.
+_SCHEMA_BYTES: bytes = (
+    importlib.resources.files(__package__).joinpath("schema.fbs").read_bytes()
+)
+
+# Directory holding a copy of the schema for flatc, shared by all calls in this process.
+_schema_dir: Optional[tempfile.TemporaryDirectory] = None
+
 
 def convert_to_flatbuffer(vk_graph: VkGraph) -> bytes:
-    vk_graph_json = json.dumps(vk_graph, cls=_DataclassEncoder)
+    if os.getenv(_USE_FLATC_ENV, "").strip() not in {"", "0"}:
+        return convert_to_flatbuffer_with_flatc(vk_graph)
+    return vk_graph_to_flatbuffer(vk_graph)
+
+
+def _float_to_json(value: float) -> Union[float, str]:
+    # json writes -inf as -Infinity and orjson writes non-finite floats as null, both
+    # of which flatc rejects. flatc does accept them as strings, e.g. "-inf".
+    return value if math.isfinite(value) else str(value)
+
+
+# The functions below convert a VkGraph to the JSON layout that flatc expects, with
+# one function per schema type. Walking the known schema directly avoids the generic
+# _DataclassEncoder, which looks up each dataclass's fields and type hints for every
+# object it encodes.
+
+
+def _operator_call_to_json(op: OperatorCall) -> Dict[str, Any]:
+    return {"node_id": op.node_id, "name": op.name, "args": op.args}
+
+
+def _vk_tensor_to_json(tensor: VkTensor) -> Dict[str, Any]:
+    return {
+        "datatype": int(tensor.datatype),
+        "dims": tensor.dims,
+        "constant_id": tensor.constant_id,
+        "mem_obj_id": tensor.mem_obj_id,
+        "storage_type": int(tensor.storage_type),
+        "memory_layout": int(tensor.memory_layout),
+    }
+
+
+_GRAPH_TYPES_TO_JSON: Dict[Type[GraphTypes], Callable[[Any], Dict[str, Any]]] = {
+    Null: lambda value: {},
+    Int: lambda value: {"int_val": value.int_val},
+    Double: lambda value: {"double_val": _float_to_json(value.double_val)},
+    Bool: lambda value: {"bool_val": value.bool_val},
+    VkTensor: _vk_tensor_to_json,
+    IntList: lambda value: {"items": value.items},
+    DoubleList: lambda value: {"items": [_float_to_json(v) for v in value.items]},
+    BoolList: lambda value: {"items": value.items},
+    ValueList: lambda value: {"items": value.items},
+    String: lambda value: {"string_val": value.string_val},
+}
+
+
+def _vk_value_to_json(vk_value: VkValue) -> Dict[str, Any]:
+    value = vk_value.value
+    value_cls = type(value)
+    return {
+        "value": _GRAPH_TYPES_TO_JSON[value_cls](value),
+        # Union fields carry the name of their member type, as _DataclassEncoder does.
+        "value_type": value_cls.__name__,
+    }
+
+
+def _vk_bytes_to_json(vk_bytes: VkBytes) -> Dict[str, Any]:
+    return {"offset": vk_bytes.offset, "length": vk_bytes.length}
+
+
+def _vk_graph_to_json(vk_graph: VkGraph) -> bytes:
+    graph_json = {
+        "version": vk_graph.version,
+        "chain": [_operator_call_to_json(op) for op in vk_graph.chain],
+        "values": [_vk_value_to_json(value) for value in vk_graph.values],
+        "input_ids": vk_graph.input_ids,
+        "output_ids": vk_graph.output_ids,
+        "constants": [_vk_bytes_to_json(b) for b in vk_graph.constants],
+        "shaders": [_vk_bytes_to_json(b) for b in vk_graph.shaders],
+        "storage_type_override": int(vk_graph.storage_type_override),
+        "memory_layout_override": int(vk_graph.memory_layout_override),
+    }
+    if orjson is None:
+        return json.dumps(graph_json).encode("ascii")
+    return orjson.dumps(graph_json)
+
+
+def _get_schema_path() -> str:
+    """
+    Returns the path to a copy of the schema that flatc can read. flatc tells schema
+    files apart from data files by their .fbs extension, so the schema has to be a real
+    file; it is written once and reused, rather than written out for every call.
+    """
+    global _schema_dir
+    if _schema_dir is None:
+        _schema_dir = tempfile.TemporaryDirectory()
+    schema_path = os.path.join(_schema_dir.name, "schema.fbs")
+    # Rewrite the schema if something (e.g. a tmp cleaner) removed it.
+    if not os.path.exists(schema_path):
+        os.makedirs(_schema_dir.name, exist_ok=True)
+        with open(schema_path, "wb") as schema_file:
+            schema_file.write(_SCHEMA_BYTES)
+    return schema_path
+
+
+def convert_to_flatbuffer_with_flatc(vk_graph: VkGraph) -> bytes:
+    vk_graph_json = _vk_graph_to_json(vk_graph)
+    if _bindings is not None:
+        # Compile in-process from memory, without any temporary files.
+        return _bindings.flatc_compile_mem(_SCHEMA_BYTES, vk_graph_json)
+
+    schema_path = _get_schema_path()
 
     with tempfile.TemporaryDirectory() as d:
-        schema_path = os.path.join(d, "schema.fbs")
-        with open(schema_path, "wb") as schema_file:
-            schema_file.write(pkg_resources.resource_string(__name__, "schema.fbs"))
         json_path = os.path.join(d, "schema.json")
         with open(json_path, "wb") as json_file:
-            json_file.write(vk_graph_json.encode("ascii"))
+            json_file.write(vk_graph_json)
         _flatc_compile(d, schema_path, json_path)
         output_path = os.path.join(d, "schema.bin")
         with open(output_path, "rb") as output_file:
             return output_file.read()
 
 
-@dataclass
+# Layout of VulkanDelegateHeader: 4 zero bytes, magic, header length, flatbuffer
+# offset, flatbuffer size, bytes offset, bytes size. Little-endian with no alignment
+# padding between fields. The leading zero bytes are part of the format ("4x"), so they
+# are written and skipped without being passed around.
+_HEADER_STRUCT: struct.Struct = struct.Struct("<4x4sHIIIQ")
+# The same layout for reading. from_bytes checks the magic before unpacking, so it is
+# skipped along with the zero bytes rather than decoded a second time.
+_HEADER_READ_STRUCT: struct.Struct = struct.Struct("<8xHIIIQ")
+
+
+@dataclass(frozen=True, slots=True)
 class VulkanDelegateHeader:
-    # Defines the byte region that each component of the header corresponds to
+    # Defines the byte region that each component of the header corresponds to. The
+    # fields themselves are packed with _HEADER_STRUCT and unpacked with
+    # _HEADER_READ_STRUCT.
     MAGIC_IX: ClassVar[slice] = slice(4, 8)
     HEADER_SIZE_IX: ClassVar[slice] = slice(8, 10)
     FLATBUFFER_OFFSET_IX: ClassVar[slice] = slice(10, 14)
@@ -63,23 +216,28 @@ class VulkanDelegateHeader:
 
     @staticmethod
     def from_bytes(data: bytes) -> "VulkanDelegateHeader":
-        if len(data) > VulkanDelegateHeader.EXPECTED_LENGTH:
-            raise ValueError(
-                f"Expected header to be {VulkanDelegateHeader.EXPECTED_LENGTH} bytes, "
-                f"but got {len(data)} bytes."
-            )
-
-        magic_b: bytes = data[VulkanDelegateHeader.MAGIC_IX]
-
+        # Check the magic first: if it doesn't match, the data is not a header at all,
+        # which is a more useful error than a size mismatch.
+        magic_b: bytes = data[4:8]
         if magic_b != VulkanDelegateHeader.EXPECTED_MAGIC:
             raise ValueError(
                 f"Expected magic bytes to be {VulkanDelegateHeader.EXPECTED_MAGIC}, "
                 f"but got {magic_b}."
             )
 
-        length: int = int.from_bytes(
-            data[VulkanDelegateHeader.HEADER_SIZE_IX], byteorder="little"
-        )
+        if len(data) != VulkanDelegateHeader.EXPECTED_LENGTH:
+            raise ValueError(
+                f"Expected header to be {VulkanDelegateHeader.EXPECTED_LENGTH} bytes, "
+                f"but got {len(data)} bytes."
+            )
+
+        (
+            length,
+            flatbuffer_offset,
+            flatbuffer_size,
+            bytes_offset,
+            bytes_size,
+        ) = _HEADER_READ_STRUCT.unpack_from(data)
 
         if length != VulkanDelegateHeader.EXPECTED_LENGTH:
             raise ValueError(
@@ -87,16 +245,11 @@ class VulkanDelegateHeader:
                 f"but got {length} bytes."
             )
 
-        flatbuffer_offset_b: bytes = data[VulkanDelegateHeader.FLATBUFFER_OFFSET_IX]
-        flatbuffer_size_b: bytes = data[VulkanDelegateHeader.FLATBUFFER_SIZE_IX]
-        bytes_offset_b: bytes = data[VulkanDelegateHeader.BYTES_OFFSET_IX]
-        bytes_size_b: bytes = data[VulkanDelegateHeader.BYTES_SIZE_IX]
-
         return VulkanDelegateHeader(
-            flatbuffer_offset=int.from_bytes(flatbuffer_offset_b, byteorder="little"),
-            flatbuffer_size=int.from_bytes(flatbuffer_size_b, byteorder="little"),
-            bytes_offset=int.from_bytes(bytes_offset_b, byteorder="little"),
-            bytes_size=int.from_bytes(bytes_size_b, byteorder="little"),
+            flatbuffer_offset=flatbuffer_offset,
+            flatbuffer_size=flatbuffer_size,
+            bytes_offset=bytes_offset,
+            bytes_size=bytes_size,
         )
 
     def is_valid(self) -> bool:
@@ -116,22 +269,18 @@ class VulkanDelegateHeader:
         if not self.is_valid():
             raise ValueError("VulkanDelegateHeader instance contains invalid values")
 
-        data: bytes = (
-            # 4 bytes of padding for magic bytes, this is so that the header magic
-            # bytes is in the same position as the flatbuffer header magic bytes
-            b"\x00\x00\x00\x00"
-            + self.EXPECTED_MAGIC
-            + self.EXPECTED_LENGTH.to_bytes(2, byteorder="little")
-            + self.flatbuffer_offset.to_bytes(4, byteorder="little")
-            + self.flatbuffer_size.to_bytes(4, byteorder="little")
-            + self.bytes_offset.to_bytes(4, byteorder="little")
-            + self.bytes_size.to_bytes(8, byteorder="little")
+        # _HEADER_STRUCT starts with 4 bytes of padding for magic bytes, this is so that
+        # the header magic bytes is in the same position as the flatbuffer header magic
+        # bytes
+        return _HEADER_STRUCT.pack(
+            self.EXPECTED_MAGIC,
+            self.EXPECTED_LENGTH,
+            self.flatbuffer_offset,
+            self.flatbuffer_size,
+            self.bytes_offset,
+            self.bytes_size,
         )
 
-        assert len(data) == VulkanDelegateHeader.EXPECTED_LENGTH
-
-        return data
-
 
 def padding_required(data_len: int, alignment: int = 16) -> int:
     remainder: int = data_len % alignment
@@ -167,13 +316,13 @@ def serialize_constant_tensors(
             ctypes.POINTER(array_type),
         ).contents
 
-        tensor_bytes = bytes(array)
-        # Pad the tensor bytes to the next 16 byte boundary
-        raw_bytes += tensor_bytes
-        raw_bytes += b"\x00" * padding_required(len(tensor_bytes))
+        # Append the tensor's storage directly without an intermediate bytes copy, and
+        # pad it to the next 16 byte boundary
+        raw_bytes += array
+        raw_bytes += b"\x00" * padding_required(len(array))
 
-        vk_graph.constants.append(VkBytes(current_offset, len(tensor_bytes)))
-        current_offset += aligned_size(len(tensor_bytes))
+        vk_graph.constants.append(VkBytes(current_offset, len(array)))
+        current_offset += aligned_size(len(array))
 
 
 def serialize_custom_shaders(
@@ -198,7 +347,6 @@ def serialize_vulkan_graph(
     raw_bytes = bytearray()
     serialize_constant_tensors(vk_graph, const_tensors, raw_bytes)
     serialize_custom_shaders(vk_graph, custom_shaders, raw_bytes)
-    raw_bytes = bytes(raw_bytes)
 
     flatbuffer_payload = convert_to_flatbuffer(vk_graph)
 
@@ -213,6 +361,8 @@ def serialize_vulkan_graph(
         bytes_size=len(raw_bytes),
     ).to_bytes()
 
+    # raw_bytes is a bytearray, so padding it happens in place; the join below is the
+    # only copy of the constant data.
     return b"".join(
         [
             pad_to(header, header_len),
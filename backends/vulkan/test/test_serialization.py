@@ -5,18 +5,47 @@
 # LICENSE file in the root directory of this source tree.
 
 import ctypes
+import dataclasses
+import json
+import os
 import random
+import tempfile
 import unittest
-from typing import List
+from typing import Any, get_args, get_origin, get_type_hints, List, Union
 
 import torch
 
-from executorch.backends.vulkan.serialization.vulkan_graph_schema import VkGraph
+from executorch.backends.vulkan.serialization import vulkan_graph_serialize
+from executorch.backends.vulkan.serialization.vulkan_graph_flatbuffer import (
+    _GRAPH_TYPES,
+    vk_graph_to_flatbuffer,
+)
+from executorch.backends.vulkan.serialization.vulkan_graph_schema import (
+    Bool,
+    BoolList,
+    Double,
+    DoubleList,
+    GraphTypes,
+    Int,
+    IntList,
+    Null,
+    OperatorCall,
+    String,
+    ValueList,
+    VkBytes,
+    VkDataType,
+    VkGraph,
+    VkStorageType,
+    VkTensor,
+    VkValue,
+)
 
 from executorch.backends.vulkan.serialization.vulkan_graph_serialize import (
+    convert_to_flatbuffer_with_flatc,
     serialize_vulkan_graph,
     VulkanDelegateHeader,
 )
+from executorch.exir._serialize._flatbuffer import _flatc_decompile
 
 
 class TestSerialization(unittest.TestCase):
@@ -93,3 +122,89 @@ class TestSerialization(unittest.TestCase):
 
             tensor_bytes = bytes(array)
             self.assertEqual(constant_data_bytes, tensor_bytes)
+
+    def _flatbuffer_to_json(self, flatbuffer: bytes) -> bytes:
+        with tempfile.TemporaryDirectory() as d:
+            schema_path = os.path.join(d, "schema.fbs")
+            with open(schema_path, "wb") as schema_file:
+                schema_file.write(vulkan_graph_serialize._SCHEMA_BYTES)
+            bin_path = os.path.join(d, "schema.bin")
+            with open(bin_path, "wb") as bin_file:
+                bin_file.write(flatbuffer)
+            _flatc_decompile(d, schema_path, bin_path)
+            with open(os.path.join(d, "schema.json"), "rb") as json_file:
+                return json_file.read()
+
+    def _example_vk_graph(self) -> VkGraph:
+        """
+        Returns a VkGraph that holds a value of every member of GraphTypes.
+        """
+        return VkGraph(
+            version="0",
+            chain=[OperatorCall(node_id=1, name="aten.add.Tensor", args=[0, 1, 2])],
+            values=[
+                VkValue(Null()),
+                VkValue(Int(-3)),
+                VkValue(Double(0.5)),
+                VkValue(Double(float("-inf"))),
+                VkValue(Bool(True)),
+                VkValue(VkTensor(VkDataType.FLOAT32, [1, 2, 3], -1, 0)),
+                VkValue(VkTensor(VkDataType.INT8, [4], 0, -1, VkStorageType.BUFFER)),
+                VkValue(IntList([1, 2])),
+                VkValue(DoubleList([1.5, -2.0, float("inf")])),
+                VkValue(BoolList([True, False])),
+                VkValue(ValueList([0, 1])),
+                VkValue(String("foo")),
+            ],
+            input_ids=[0, 1],
+            output_ids=[2],
+            constants=[VkBytes(0, 16), VkBytes(16, 32)],
+            shaders=[],
+        )
+
+    def test_flatbuffer_builder_matches_flatc(self):
+        vk_graph = self._example_vk_graph()
+        flatbuffer = vk_graph_to_flatbuffer(vk_graph)
+        self.assertEqual(flatbuffer[4:8], b"VK00")
+        self.assertEqual(
+            self._flatbuffer_to_json(flatbuffer),
+            self._flatbuffer_to_json(convert_to_flatbuffer_with_flatc(vk_graph)),
+        )
+
+    def test_graph_types_are_all_handled(self):
+        graph_types = set(get_args(GraphTypes))
+        self.assertEqual(set(_GRAPH_TYPES), graph_types)
+        self.assertEqual(set(vulkan_graph_serialize._GRAPH_TYPES_TO_JSON), graph_types)
+        self.assertEqual(
+            {type(value.value) for value in self._example_vk_graph().values},
+            graph_types,
+        )
+
+    # pyre-ignore
+    def _assert_json_has_fields(self, obj: Any, obj_json: Any) -> None:
+        """
+        Checks that `obj_json` has a key for every field of every dataclass in `obj`,
+        plus a "<field>_type" key for union fields, as _DataclassEncoder writes them.
+        """
+        if isinstance(obj, list):
+            self.assertEqual(len(obj), len(obj_json))
+            for item, item_json in zip(obj, obj_json):
+                self._assert_json_has_fields(item, item_json)
+            return
+        if not dataclasses.is_dataclass(obj):
+            return
+
+        expected_keys = set()
+        type_hints = get_type_hints(type(obj))
+        for field in dataclasses.fields(obj):
+            expected_keys.add(field.name)
+            if get_origin(type_hints[field.name]) is Union:
+                expected_keys.add(f"{field.name}_type")
+            self._assert_json_has_fields(getattr(obj, field.name), obj_json[field.name])
+        self.assertEqual(set(obj_json), expected_keys, type(obj).__name__)
+
+    def test_json_matches_schema_fields(self):
+        vk_graph = self._example_vk_graph()
+        self._assert_json_has_fields(
+            vk_graph, json.loads(vulkan_graph_serialize._vk_graph_to_json(vk_graph))
+        )
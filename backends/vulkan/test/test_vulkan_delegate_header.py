@@ -4,6 +4,9 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
+import copy
+import dataclasses
+import pickle
 import unittest
 
 from executorch.backends.vulkan.serialization.vulkan_graph_serialize import (
@@ -47,6 +50,27 @@ class TestVulkanDelegateHeader(unittest.TestCase):
         self.assertEqual(header.to_bytes(), EXAMPLE_HEADER_DATA)
         self.assertTrue(header.is_valid())
 
+    def test_frozen_header(self) -> None:
+        header = VulkanDelegateHeader(
+            EXAMPLE_FLATBUFFER_OFFSET,
+            EXAMPLE_FLATBUFFER_SIZE,
+            EXAMPLE_BYTES_OFFSET,
+            EXAMPLE_BYTES_SIZE,
+        )
+        self.assertEqual(header, VulkanDelegateHeader.from_bytes(header.to_bytes()))
+        self.assertEqual(
+            [f.name for f in dataclasses.fields(header)],
+            ["flatbuffer_offset", "flatbuffer_size", "bytes_offset", "bytes_size"],
+        )
+
+        # Frozen, slotted instances must still copy and pickle.
+        self.assertEqual(header, copy.copy(header))
+        self.assertEqual(header, copy.deepcopy(header))
+        self.assertEqual(header, pickle.loads(pickle.dumps(header)))
+
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            header.flatbuffer_size = 0  # pyre-ignore[41]
+
     def test_from_bytes(self) -> None:
         header = VulkanDelegateHeader.from_bytes(EXAMPLE_HEADER_DATA)
         self.assertEqual(header.flatbuffer_offset, EXAMPLE_FLATBUFFER_OFFSET)
@@ -62,6 +86,13 @@ class TestVulkanDelegateHeader(unittest.TestCase):
         ):
             VulkanDelegateHeader.from_bytes(WRONG_MAGIC_DATA)
 
+        # The magic is checked before the size of the data.
+        with self.assertRaisesRegex(
+            ValueError,
+            "Expected magic bytes to be b'VH00', but got b'YT01'",
+        ):
+            VulkanDelegateHeader.from_bytes(WRONG_MAGIC_DATA + b"\x00")
+
         WRONG_LENGTH_DATA = (
             EXAMPLE_HEADER_DATA[0:8] + b"\x1D\x00" + EXAMPLE_HEADER_DATA[10:]
         )
@@ -75,6 +106,11 @@ class TestVulkanDelegateHeader(unittest.TestCase):
         ):
             VulkanDelegateHeader.from_bytes(EXAMPLE_HEADER_DATA + b"\x00")
 
+        with self.assertRaisesRegex(
+            ValueError, "Expected header to be 30 bytes, but got 29 bytes."
+        ):
+            VulkanDelegateHeader.from_bytes(EXAMPLE_HEADER_DATA[:-1])
+
     def test_invalid_flatbuffer_size(self) -> None:
         header = VulkanDelegateHeader(
             EXAMPLE_FLATBUFFER_OFFSET,
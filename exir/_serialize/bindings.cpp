@@ -96,6 +96,26 @@ PYBIND11_MODULE(_bindings, m) {
                 "--",
                 binPath.c_str()};
             return flatc.Compile(argv.size(), argv.data());
+          })
+      .def(
+          "flatc_compile_mem",
+          [](const std::string& schema, const std::string& json) {
+            // Parses the schema and then the JSON data in-process, without
+            // touching the filesystem. The schema must not include other files.
+            flatbuffers::Parser parser;
+            if (!parser.Parse(schema.c_str())) {
+              throw std::runtime_error(
+                  "Caught error parsing flatbuffer schema: " + parser.error_);
+            }
+            if (!parser.Parse(json.c_str())) {
+              throw std::runtime_error(
+                  "Caught error parsing flatbuffer JSON data: " +
+                  parser.error_);
+            }
+            return pybind11::bytes(
+                reinterpret_cast<const char*>(
+                    parser.builder_.GetBufferPointer()),
+                parser.builder_.GetSize());
           });
 }
 
@@ -4,7 +4,6 @@
 # This source code is licensed under the BSD-style license found in the
 # LICENSE file in the root directory of this source tree.
 
-import copy
 import unittest
 
 import torch
@@ -40,12 +39,17 @@ class TestModel1(nn.Module):
 
 
 class TestRemoveViewCopy(unittest.TestCase):
-    def test_disable(self) -> None:
+    @classmethod
+    def setUpClass(cls) -> None:
+        # Exporting is the slowest part of these tests, and to_edge does not modify the
+        # ExportedProgram it is given, so export once and share it between tests.
         model = TestModel1()
         model.eval()
-        example_inputs = model.get_example_inputs()
-        ep = torch.export.export(model, example_inputs)
-        etpm = to_edge(ep).to_executorch(
+        cls.example_inputs = model.get_example_inputs()
+        cls.ep = torch.export.export(model, cls.example_inputs)
+
+    def test_disable(self) -> None:
+        etpm = to_edge(self.ep).to_executorch(
             config=ExecutorchBackendConfig(
                 remove_view_copy=False,
                 memory_planning_pass=MemoryPlanningPass(
@@ -58,17 +62,12 @@ class TestRemoveViewCopy(unittest.TestCase):
             assert node.target != memory.view
 
     def test_output_matches(self) -> None:
-        model = TestModel1()
-        model.eval()
-        example_inputs = model.get_example_inputs()
-        ep = torch.export.export(model, example_inputs)
-
-        epm_remove = to_edge(ep)
-        epm_no_remove = copy.deepcopy(
-            epm_remove
-        )  # to_executorch modifies the edge_program, so we make a copy
+        # to_executorch modifies the edge program, so lower each run from its own
+        # to_edge call. This is cheaper than deep copying an EdgeProgramManager.
+        epm_remove = to_edge(self.ep)
+        epm_no_remove = to_edge(self.ep)
 
-        # Run pass with no removal
+        # Run pass with removal
         etpm_remove = epm_remove.to_executorch(
             config=ExecutorchBackendConfig(
                 remove_view_copy=True,
@@ -78,10 +77,10 @@ class TestRemoveViewCopy(unittest.TestCase):
             ),
         )
 
-        # Run pass with removal
+        # Run pass with no removal
         etpm_no_remove = epm_no_remove.to_executorch(
             config=ExecutorchBackendConfig(
-                remove_view_copy=True,
+                remove_view_copy=False,
                 memory_planning_pass=MemoryPlanningPass(
                     "greedy", alloc_graph_input=False
                 ),
@@ -89,22 +88,79 @@ class TestRemoveViewCopy(unittest.TestCase):
         )
 
         out_remove_v5, out_remove_v6 = etpm_remove.exported_program().module()(
-            *example_inputs
+            *self.example_inputs
         )
         out_no_remove_v5, out_no_remove_v6 = etpm_no_remove.exported_program().module()(
-            *example_inputs
+            *self.example_inputs
         )
 
         self.assertTrue(torch.allclose(out_remove_v5, out_no_remove_v5))
         self.assertTrue(torch.allclose(out_remove_v6, out_no_remove_v6))
 
-    def test_spec(self) -> None:
-        model = TestModel1()
-        model.eval()
-        example_inputs = model.get_example_inputs()
-        ep = torch.export.export(model, example_inputs)
+    def _check_p_parameter(self, node: torch.fx.Node) -> None:
+        # p_parameter's lifetime is extended through aten_view_copy_default (memory.view) to idx 6
+        self.assertEqual(node.meta["spec"].lifetime, [0, 6])
+
+    def _check_aten_view_copy_default(self, node: torch.fx.Node) -> None:
+        # aten_view_copy_default is a memory.view of p_parameter.
+        # p_parameter is a constant with storage, so we check that the view's storage matches the base
+        spec = node.meta["spec"]
+        base = node.args[0]
+        base_spec = base.meta["spec"]
+
+        # assert base is p_parameter
+        self.assertEqual(base.name, "p_parameter")
+
+        # assert base is const with storage
+        self.assertTrue(base_spec.const)
+        self.assertTrue(base_spec.storage is not None)
+        self.assertTrue(base_spec.mem_id is None)
+        self.assertTrue(base_spec.mem_offset is None)
+
+        # assert self is const with storage
+        self.assertTrue(spec.const)
+        self.assertTrue(spec.storage is not None)
+        self.assertTrue(spec.mem_id is None)
+        self.assertTrue(spec.mem_offset is None)
+
+        # assert storage matches
+        self.assertEqual(spec.storage, base_spec.storage)
+
+        # assert lifetime matches
+        self.assertEqual(spec.lifetime, base_spec.lifetime)
+
+    def _check_aten_mul_tensor(self, node: torch.fx.Node) -> None:
+        # aten_mul_tensor's lifetime is extended through aten_view_copy_default_2 (memory.view) to idx 9
+        self.assertEqual(node.meta["spec"].lifetime, [5, 9])
+
+    def _check_aten_view_copy_default_2(self, node: torch.fx.Node) -> None:
+        # aten_view_copy_default_2 is a memory.view of aten_mul_tensor
+        spec = node.meta["spec"]
+        base = node.args[0]
+        base_spec = base.meta["spec"]
+
+        # assert base is aten_mul_tensor
+        self.assertEqual(base.name, "aten_mul_tensor")
+
+        # assert base and self are not const, do not have storage,
+        # but do have mem_id and mem_offset
+        self.assertFalse(base_spec.const)
+        self.assertTrue(base_spec.storage is None)
+        self.assertTrue(base_spec.mem_id is not None)
+        self.assertTrue(base_spec.mem_offset is not None)
+
+        self.assertFalse(spec.const)
+        self.assertTrue(spec.storage is None)
+        self.assertTrue(spec.mem_id is not None)
+        self.assertTrue(spec.mem_offset is not None)
+
+        # assert self and base mem_id, mem_offset, and lifetime matches
+        self.assertEqual(spec.mem_id, base_spec.mem_id)
+        self.assertEqual(spec.mem_offset, base_spec.mem_offset)
+        self.assertEqual(spec.lifetime, base_spec.lifetime)
 
-        etpm = to_edge(ep).to_executorch(
+    def test_spec(self) -> None:
+        etpm = to_edge(self.ep).to_executorch(
             config=ExecutorchBackendConfig(
                 remove_view_copy=True,
                 memory_planning_pass=MemoryPlanningPass(
@@ -131,69 +187,16 @@ class TestRemoveViewCopy(unittest.TestCase):
         # 11   call_function  aten_view_copy_default_3  aten.view_copy.out                  (aten_mul_tensor_1, [6, 5])                         {'out': alloc_2}
         # 12   output         output_1                  output                              ((aten_view_copy_default_3,),)                      {}
 
+        checks = {
+            "p_parameter": self._check_p_parameter,
+            "aten_view_copy_default": self._check_aten_view_copy_default,
+            "aten_mul_tensor": self._check_aten_mul_tensor,
+            "aten_view_copy_default_2": self._check_aten_view_copy_default_2,
+        }
         for node in etpm.exported_program().graph.nodes:
-            if node.name == "p_parameter":
-                # p_parameter's lifetime is extended through aten_view_copy_default (memory.view) to idx 6
-                self.assertEqual(node.meta["spec"].lifetime, [0, 6])
-            elif node.name == "aten_view_copy_default":
-                # aten_view_copy_default is a memory.view of p_parameter.
-                # p_parameter is a constant with storage, so we check that the view's storage matches the base
-
-                # assert base is p_parameter
-                self.assertEqual(node.args[0].name, "p_parameter")
-
-                # assert base is const with storage
-                self.assertTrue(node.args[0].meta["spec"].const)
-                self.assertTrue(node.args[0].meta["spec"].storage is not None)
-                self.assertTrue(node.args[0].meta["spec"].mem_id is None)
-                self.assertTrue(node.args[0].meta["spec"].mem_offset is None)
-
-                # assert self is const with storage
-                self.assertTrue(node.meta["spec"].const)
-                self.assertTrue(node.meta["spec"].storage is not None)
-                self.assertTrue(node.meta["spec"].mem_id is None)
-                self.assertTrue(node.meta["spec"].mem_offset is None)
-
-                # assert storage matches
-                self.assertEqual(
-                    node.meta["spec"].storage, node.args[0].meta["spec"].storage
-                )
-
-                # assert lifetime matches
-                self.assertEqual(
-                    node.meta["spec"].lifetime, node.args[0].meta["spec"].lifetime
-                )
-            elif node.name == "aten_mul_tensor":
-                # aten_mul_tensor's lifetime is extended through aten_view_copy_default_2 (memory.view) to idx 9
-                self.assertEqual(node.meta["spec"].lifetime, [5, 9])
-            elif node.name == "aten_view_copy_default_2":
-                # aten_view_copy_default_2 is a memory.view of aten_mul_tensor
-
-                # assert base is aten_mul_tensor
-                self.assertEqual(node.args[0].name, "aten_mul_tensor")
-
-                # assert base and self are not const, do not have storage,
-                # but do have mem_id and mem_offset
-                self.assertFalse(node.args[0].meta["spec"].const)
-                self.assertTrue(node.args[0].meta["spec"].storage is None)
-                self.assertTrue(node.args[0].meta["spec"].mem_id is not None)
-                self.assertTrue(node.args[0].meta["spec"].mem_offset is not None)
-
-                self.assertFalse(node.meta["spec"].const)
-                self.assertTrue(node.meta["spec"].storage is None)
-                self.assertTrue(node.meta["spec"].mem_id is not None)
-                self.assertTrue(node.meta["spec"].mem_offset is not None)
-
-                # assert self and base mem_id, mem_offset, and lifetime matches
-                self.assertEqual(
-                    node.meta["spec"].mem_id, node.args[0].meta["spec"].mem_id
-                )
-                self.assertEqual(
-                    node.meta["spec"].mem_offset, node.args[0].meta["spec"].mem_offset
-                )
-                self.assertEqual(
-                    node.meta["spec"].lifetime, node.args[0].meta["spec"].lifetime
-                )
+            check = checks.get(node.name)
+            if check is not None:
+                check(node)
 
         # Test evalues in execution plan
         plan = etpm.executorch_program.execution_plan[0]